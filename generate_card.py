@@ -7,19 +7,335 @@ using local LLM processing.
 
 Usage:
     python generate_card.py --image input_photo.png --markdown profile.md --output output_card.png
+    python generate_card.py --batch manifest.csv
 """
 
 import argparse
+import csv
+import functools
+import hashlib
 import os
+import shutil
 import sys
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import torch
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.markdown_parser import MarkdownParser
-from src.llm_processor import LLMProcessor
-from src.image_composer import ImageComposer
+from src.llm_processor import LLMProcessor, SOURCE_FALLBACK
+from src.image_composer import CardContent, ImageComposer
+
+
+# Finished cards and LLM summaries are cached here, keyed by input hashes
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'cardforge')
+
+# Part of every card key; bump it when a change to the renderer or card
+# template should invalidate previously cached cards
+CARD_CACHE_VERSION = 1
+
+
+def _cache_key(*parts: bytes) -> str:
+    """Hash the given inputs into a cache key."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        # Length-prefix each part so different splits never collide
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _store_in_cache(cache_path: str, source_path: Optional[str] = None, data: Optional[bytes] = None):
+    """Atomically write a file (or a copy of source_path) into the cache."""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    if source_path is not None:
+        shutil.copyfile(source_path, tmp_path)
+    else:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+    os.replace(tmp_path, cache_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm_processor(model_name: str,
+                       quantization: str = 'auto',
+                       compile_model: bool = False) -> LLMProcessor:
+    """Return the LLM processor for a model, loading it once per process."""
+    return LLMProcessor(model_name=model_name, quantization=quantization,
+                        compile_model=compile_model)
+
+
+def generate_one(image_path: str,
+                 markdown_path: str,
+                 output_path: str,
+                 model_name: str = 'microsoft/DialoGPT-medium',
+                 quantization: str = 'auto',
+                 compile_model: bool = False,
+                 width: int = 800,
+                 height: int = 600,
+                 small_save: bool = False,
+                 use_cache: bool = True,
+                 verbose: bool = False) -> None:
+    """
+    Generate a single profile card.
+    
+    Finished cards are cached under CACHE_DIR keyed by the image, markdown,
+    model, quantization and output settings, so regenerating an unchanged
+    card is a file copy. The LLM summary is cached separately by markdown,
+    model and quantization, so changing only the image or card size skips
+    the LLM step.
+    
+    Args:
+        image_path: Path to the profile image
+        markdown_path: Path to the markdown profile file
+        output_path: Path for the output card image
+        model_name: LLM model to use for text processing
+        quantization: Weight quantization mode, see LLMProcessor
+        compile_model: Compile the model with torch.compile on CUDA
+        width: Card width in pixels
+        height: Card height in pixels
+        small_save: Compress the output PNG harder (slower, smaller file)
+        use_cache: Reuse and store cached cards and summaries
+        verbose: Print progress information
+    """
+    # Validate input files
+    if not os.path.exists(image_path):
+        raise FileNotFoundError(f"Image file not found: {image_path}")
+    
+    if not os.path.exists(markdown_path):
+        raise FileNotFoundError(f"Markdown file not found: {markdown_path}")
+    
+    # Create output directory if it doesn't exist
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+        if verbose:
+            print(f"Created output directory: {output_dir}")
+    
+    # Check the cache for a finished card
+    if use_cache:
+        with open(image_path, 'rb') as f:
+            image_bytes = f.read()
+        with open(markdown_path, 'rb') as f:
+            markdown_bytes = f.read()
+        
+        card_key = _cache_key(str(CARD_CACHE_VERSION).encode(),
+                              image_bytes, markdown_bytes, model_name.encode(), quantization.encode(),
+                              f"{width}x{height}:{int(small_save)}".encode())
+        cached_card = os.path.join(CACHE_DIR, 'cards', f"{card_key}.png")
+        if os.path.exists(cached_card):
+            shutil.copyfile(cached_card, output_path)
+            print(f"Card restored from cache: {output_path}")
+            return
+        
+        cached_summary = os.path.join(
+            CACHE_DIR, 'summaries', f"{_cache_key(markdown_bytes, model_name.encode(), quantization.encode())}.txt")
+    
+    # Initialize components
+    if verbose:
+        print("Initializing CardForge components...")
+    
+    markdown_parser = MarkdownParser()
+    image_composer = ImageComposer(card_width=width, card_height=height)
+    
+    # Step 1: Parse markdown
+    if verbose:
+        print(f"Parsing markdown file: {markdown_path}")
+    
+    profile_data = markdown_parser.parse_file(markdown_path)
+    
+    if verbose:
+        print(f"Found sections: {profile_data.section_names()}")
+    
+    # Step 2: Extract key content for LLM
+    key_content = markdown_parser.extract_key_points(profile_data)
+    
+    if verbose:
+        print("Extracted key content for LLM processing:")
+        print(key_content[:200] + "..." if len(key_content) > 200 else key_content)
+    
+    # Step 3: Process with LLM
+    list_text = markdown_parser.extract_list_text(profile_data)
+    # Profiles that already list enough bullets are summarized from them,
+    # without loading the model at all
+    list_summary = LLMProcessor.summarize_list_items(list_text)
+    
+    if list_summary is not None:
+        if verbose:
+            print("Profile lists enough bullets, skipping the LLM")
+        summary_text = list_summary
+        summary_cacheable = True
+    elif use_cache and os.path.exists(cached_summary):
+        if verbose:
+            print("Using cached LLM summary")
+        with open(cached_summary, 'r', encoding='utf-8') as f:
+            summary_text = f.read()
+        summary_cacheable = True
+    else:
+        llm_processor = _get_llm_processor(model_name, quantization, compile_model)
+        device_info = llm_processor.get_device_info()
+        
+        # Display device info
+        if verbose:
+            print(f"Device: {device_info['device']}")
+            print(f"CUDA available: {device_info['cuda_available']}")
+            print(f"Model: {device_info['model_name']}")
+            print(f"Model loaded: {device_info['model_loaded']}")
+            print("Processing text with LLM...")
+        
+        summary_text, summary_source = llm_processor.summarize_profiles_with_source(
+            [key_content], list_texts=[list_text])[0]
+        
+        # Rule-based stand-ins for a missing or failed model are not cached,
+        # so a later run with a working model still gets a model summary
+        summary_cacheable = summary_source != SOURCE_FALLBACK
+        if use_cache and summary_cacheable:
+            _store_in_cache(cached_summary, data=summary_text.encode('utf-8'))
+    
+    if verbose:
+        print("LLM Summary:")
+        print(summary_text)
+    
+    # Keep only the fields the card shows
+    content = CardContent.from_profile(profile_data, summary_text)
+    del profile_data
+    
+    # Step 4: Compose the card
+    if verbose:
+        print(f"Composing card with image: {image_path}")
+    
+    card_image = image_composer.create_card(image_path, content)
+    
+    # Step 5: Save the result
+    image_composer.save_card(card_image, output_path, small=small_save)
+    
+    # Cards with a rule-based summary are not cached either, for the same reason
+    if use_cache and summary_cacheable:
+        _store_in_cache(cached_card, source_path=output_path)
+    
+    # Display card info
+    if verbose:
+        card_info = image_composer.get_card_info()
+        print(f"Card dimensions: {card_info['card_size']}")
+
+
+def _generate_batch_item(image_path: str,
+                         markdown_path: str,
+                         output_path: str,
+                         **kwargs) -> Tuple[str, Optional[str]]:
+    """Generate one card in a batch worker, returning (output, error)."""
+    try:
+        generate_one(image_path, markdown_path, output_path, **kwargs)
+        return output_path, None
+    except Exception as e:
+        return output_path, str(e)
+
+
+def read_manifest(manifest_path: str) -> List[Tuple[str, str, str]]:
+    """
+    Read a batch manifest CSV with image, markdown and output columns.
+    
+    Relative paths are resolved against the manifest's directory.
+    
+    Raises:
+        ValueError: If a column is missing or a row leaves a path empty
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    columns = ('image', 'markdown', 'output')
+    rows = []
+    
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        missing = set(columns) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Manifest is missing columns: {', '.join(sorted(missing))}")
+        
+        for row in reader:
+            # Short rows leave the trailing columns as None
+            paths = tuple((row[column] or '').strip() for column in columns)
+            empty = [column for column, path in zip(columns, paths) if not path]
+            if empty:
+                raise ValueError(f"{manifest_path}, line {reader.line_num}: "
+                                 f"missing {', '.join(empty)}")
+            rows.append(tuple(os.path.join(base_dir, path) for path in paths))
+    
+    return rows
+
+
+def _default_workers() -> int:
+    """
+    Pick the number of batch workers when --workers is not given.
+    
+    Every worker loads its own copy of the LLM. On CUDA those copies all
+    land on the same GPU, so the default is a single worker there; on CPU
+    it is one worker per core.
+    """
+    if torch.cuda.is_available():
+        return 1
+    return os.cpu_count() or 1
+
+
+def _init_batch_worker(torch_threads: int):
+    """Split the CPU cores between batch workers instead of each torch using all of them."""
+    torch.set_num_threads(torch_threads)
+
+
+def run_batch(manifest_path: str,
+              model_name: str,
+              width: int,
+              height: int,
+              workers: Optional[int] = None,
+              quantization: str = 'auto',
+              compile_model: bool = False,
+              small_save: bool = False,
+              use_cache: bool = True,
+              verbose: bool = False) -> int:
+    """
+    Generate all cards listed in a manifest using a process pool.
+    
+    Args:
+        workers: Number of worker processes (default: see _default_workers)
+    
+    Returns:
+        Number of cards that failed to generate
+    """
+    rows = read_manifest(manifest_path)
+    if not rows:
+        print(f"No cards listed in manifest: {manifest_path}")
+        return 0
+    
+    worker = functools.partial(
+        _generate_batch_item,
+        model_name=model_name,
+        quantization=quantization,
+        compile_model=compile_model,
+        width=width,
+        height=height,
+        small_save=small_save,
+        use_cache=use_cache,
+        verbose=verbose,
+    )
+    images, markdowns, outputs = zip(*rows)
+    
+    workers = min(workers or _default_workers(), len(rows))
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(torch_threads,)) as executor:
+        for output_path, error in executor.map(worker, images, markdowns, outputs, chunksize=4):
+            if error:
+                failures += 1
+                print(f"❌ {output_path}: {error}")
+            else:
+                print(f"✅ {output_path}")
+    
+    print(f"Generated {len(rows) - failures}/{len(rows)} cards")
+    return failures
 
 
 def main():
@@ -31,33 +347,60 @@ def main():
 Examples:
   python generate_card.py --image photo.png --markdown profile.md --output card.png
   python generate_card.py -i examples/input_photo.png -m examples/profile.md -o output/my_card.png
+  python generate_card.py --batch manifest.csv --workers 4
         """
     )
     
     parser.add_argument(
         '--image', '-i',
-        required=True,
         help='Path to the input image (PNG recommended)'
     )
     
     parser.add_argument(
         '--markdown', '-m',
-        required=True,
         help='Path to the markdown profile file'
     )
     
     parser.add_argument(
         '--output', '-o',
-        required=True,
         help='Path for the output card image (PNG)'
     )
     
+    parser.add_argument(
+        '--batch',
+        metavar='MANIFEST',
+        help='CSV manifest with image,markdown,output columns to generate many cards'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes for --batch; each loads its own LLM copy '
+             '(default: 1 on CUDA, number of CPUs otherwise)'
+    )
+    
     parser.add_argument(
         '--model',
         default='microsoft/DialoGPT-medium',
         help='LLM model to use for text processing (default: microsoft/DialoGPT-medium)'
     )
     
+    parser.add_argument(
+        '--quantization',
+        choices=LLMProcessor.QUANTIZATION_MODES,
+        default='auto',
+        help='Weight quantization for non-DialoGPT models on CUDA (default: auto, '
+             'fp8 on Hopper and newer, int8 otherwise; none keeps full-precision weights)'
+    )
+    
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Compile the model with torch.compile on CUDA. Slow to start, so only '
+             'worth it with --batch and many cards per worker'
+    )
+    
     parser.add_argument(
         '--width',
         type=int,
@@ -72,6 +415,18 @@ Examples:
         help='Card height in pixels (default: 600)'
     )
     
+    parser.add_argument(
+        '--small-save',
+        action='store_true',
+        help='Compress the output PNG harder: smaller files, slower to save'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not reuse or store cached cards and summaries (cache: {CACHE_DIR})'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -80,80 +435,36 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate input files
-    if not os.path.exists(args.image):
-        print(f"Error: Image file not found: {args.image}")
-        sys.exit(1)
-    
-    if not os.path.exists(args.markdown):
-        print(f"Error: Markdown file not found: {args.markdown}")
-        sys.exit(1)
-    
-    # Create output directory if it doesn't exist
-    output_dir = os.path.dirname(args.output)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        if args.verbose:
-            print(f"Created output directory: {output_dir}")
+    if args.batch:
+        if not os.path.exists(args.batch):
+            print(f"Error: Manifest file not found: {args.batch}")
+            sys.exit(1)
+    elif not (args.image and args.markdown and args.output):
+        parser.error("--image, --markdown and --output are required unless --batch is given")
     
     try:
-        # Initialize components
-        if args.verbose:
-            print("Initializing CardForge components...")
-        
-        markdown_parser = MarkdownParser()
-        llm_processor = LLMProcessor(model_name=args.model)
-        image_composer = ImageComposer(card_width=args.width, card_height=args.height)
-        
-        # Display device info
-        if args.verbose:
-            device_info = llm_processor.get_device_info()
-            print(f"Device: {device_info['device']}")
-            print(f"CUDA available: {device_info['cuda_available']}")
-            print(f"Model: {device_info['model_name']}")
-            print(f"Model loaded: {device_info['model_loaded']}")
-        
-        # Step 1: Parse markdown
-        if args.verbose:
-            print(f"Parsing markdown file: {args.markdown}")
-        
-        profile_data = markdown_parser.parse_file(args.markdown)
-        
-        if args.verbose:
-            print(f"Found sections: {list(profile_data.keys())}")
+        if args.batch:
+            failures = run_batch(args.batch, args.model, args.width, args.height,
+                                 workers=args.workers, quantization=args.quantization,
+                                 compile_model=args.compile,
+                                 small_save=args.small_save,
+                                 use_cache=not args.no_cache, verbose=args.verbose)
+            if failures:
+                sys.exit(1)
+            return
         
-        # Step 2: Extract key content for LLM
-        key_content = markdown_parser.extract_key_points(profile_data)
-        
-        if args.verbose:
-            print("Extracted key content for LLM processing:")
-            print(key_content[:200] + "..." if len(key_content) > 200 else key_content)
-        
-        # Step 3: Process with LLM
-        if args.verbose:
-            print("Processing text with LLM...")
-        
-        summary_text = llm_processor.summarize_profile(key_content)
-        
-        if args.verbose:
-            print("LLM Summary:")
-            print(summary_text)
-        
-        # Step 4: Compose the card
-        if args.verbose:
-            print(f"Composing card with image: {args.image}")
-        
-        card_image = image_composer.create_card(args.image, profile_data, summary_text)
-        
-        # Step 5: Save the result
-        image_composer.save_card(card_image, args.output)
+        generate_one(args.image, args.markdown, args.output,
+                     model_name=args.model, quantization=args.quantization,
+                     compile_model=args.compile,
+                     width=args.width, height=args.height,
+                     small_save=args.small_save, use_cache=not args.no_cache,
+                     verbose=args.verbose)
         
         print(f"✅ Profile card generated successfully: {args.output}")
-        
-        # Display card info
-        if args.verbose:
-            card_info = image_composer.get_card_info()
-            print(f"Card dimensions: {card_info['card_size']}")
+    
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
     except KeyboardInterrupt:
         print("\n❌ Operation cancelled by user")
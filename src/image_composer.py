@@ -4,10 +4,81 @@ Handles combining images and text into profile cards.
 """
 
 from PIL import Image, ImageDraw, ImageFont
-from typing import Dict, Any, Tuple, Optional
-import textwrap
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, Any, List, Tuple, Optional
+import functools
 import os
 
+try:
+    import cv2
+except ImportError:
+    # OpenCV is optional; profile images are resized with Pillow without it
+    cv2 = None
+
+
+def _find_font_path(bold: bool = False) -> Optional[str]:
+    """Return the first available TrueType font path, or None."""
+    font_paths = [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/System/Library/Fonts/Arial.ttf",
+        "/Windows/Fonts/arial.ttf",
+    ]
+    
+    for path in font_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# Font paths are resolved once at import time
+_REGULAR_FONT_PATH = _find_font_path(bold=False)
+_BOLD_FONT_PATH = _find_font_path(bold=True)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """Load a font with fallback to default, cached across composers."""
+    path = _BOLD_FONT_PATH if bold else _REGULAR_FONT_PATH
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except (OSError, IOError):
+            pass
+    
+    # Fallback to default font
+    return ImageFont.load_default()
+
+
+@dataclass
+class CardContent:
+    """The text shown on a card, extracted from a parsed profile."""
+    
+    summary: str
+    title: str = 'Professional Profile'
+    about: Optional[str] = None
+    key_competencies: Optional[str] = None
+    current_aspirations: Optional[str] = None
+    
+    @classmethod
+    def from_profile(cls, profile_data: Any, summary: str) -> "CardContent":
+        """
+        Build card content from parsed profile data.
+        
+        Args:
+            profile_data: Parsed profile data from markdown; any object with
+                          title, about, key_competencies and
+                          current_aspirations attributes
+            summary: LLM-processed summary text
+        """
+        return cls(
+            summary=summary,
+            title=getattr(profile_data, 'title', 'Professional Profile'),
+            about=getattr(profile_data, 'about', None),
+            key_competencies=getattr(profile_data, 'key_competencies', None),
+            current_aspirations=getattr(profile_data, 'current_aspirations', None),
+        )
+
 
 class ImageComposer:
     """Composes profile cards from images and text."""
@@ -23,6 +94,7 @@ class ImageComposer:
         self.card_width = card_width
         self.card_height = card_height
         self.headshot_size = (200, 200)
+        self.title_height = 60
         self.margin = 20
         self.section_spacing = 15
         
@@ -35,133 +107,215 @@ class ImageComposer:
         self.section_bg_color = (255, 255, 255)  # White for sections
         
         # Try to load fonts
-        self.title_font = self._load_font(size=24, bold=True)
-        self.heading_font = self._load_font(size=16, bold=True)
-        self.body_font = self._load_font(size=12)
-        self.small_font = self._load_font(size=10)
-    
-    def _load_font(self, size: int, bold: bool = False) -> ImageFont.ImageFont:
-        """Load a font with fallback to default."""
-        font_paths = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/System/Library/Fonts/Arial.ttf",
-            "/Windows/Fonts/arial.ttf",
-        ]
+        self.title_font = _load_font(size=24, bold=True)
+        self.heading_font = _load_font(size=16, bold=True)
+        self.body_font = _load_font(size=12)
+        self.small_font = _load_font(size=10)
         
-        for path in font_paths:
-            try:
-                if os.path.exists(path):
-                    return ImageFont.truetype(path, size)
-            except (OSError, IOError):
-                continue
+        # Body text is laid out on a fixed 18px line pitch
+        self.line_height = 18
+        self._body_line_spacing = self.line_height - self.body_font.getbbox("A")[3]
         
-        # Fallback to default font
-        try:
-            return ImageFont.load_default()
-        except:
-            return ImageFont.load_default()
+        # The layout only depends on the card size, so compute it once
+        self._layout = self._compute_layout()
+        
+        # Pre-render everything static once; create_card copies the template
+        # and only draws the title, headshot and text on top
+        self._template = self._create_template()
+        self._placeholder_tile = self._create_panel_tile(
+            (self.headshot_size[0] + 1, self.headshot_size[1] + 1),
+            (200, 200, 200), outline=(100, 100, 100))
+        ImageDraw.Draw(self._placeholder_tile).text(
+            (50, 90), "No Image", fill=self.text_color, font=self.body_font)
+    
+    def _compute_layout(self) -> SimpleNamespace:
+        """Compute the fixed positions of the card elements."""
+        img_x = self.margin
+        img_y = self.title_height + self.margin
+        text_x = img_x + self.headshot_size[0] + self.margin
+        text_y = self.title_height + self.margin
+        summary_y = text_y - 5
+        
+        return SimpleNamespace(
+            title_y=15,
+            img_pos=(img_x, img_y),
+            img_rect=(img_x, img_y, img_x + self.headshot_size[0], img_y + self.headshot_size[1]),
+            text_x=text_x,
+            text_y=text_y,
+            text_width=self.card_width - text_x - self.margin,
+            summary_rect=(text_x - 10, summary_y, self.card_width - self.margin, summary_y + 140),
+            sections_y=text_y + 150,  # Approximate height for summary section
+            sections_max_y=self.card_height - 80,
+        )
+    
+    def _create_template(self) -> Image.Image:
+        """Render the static card background, title bar and summary panel."""
+        template = Image.new('RGB', (self.card_width, self.card_height), self.bg_color)
+        draw = ImageDraw.Draw(template)
+        draw.rectangle([0, 0, self.card_width, self.title_height], fill=self.title_bg_color)
+        draw.rectangle(list(self._layout.summary_rect), 
+                       fill=self.section_bg_color, outline=self.accent_color, width=1)
+        return template
+    
+    def _create_panel_tile(self, 
+                           size: Tuple[int, int], 
+                           fill: Tuple[int, int, int], 
+                           outline: Optional[Tuple[int, int, int]] = None) -> Image.Image:
+        """Render a filled (optionally outlined) rectangle as a reusable tile."""
+        tile = Image.new('RGB', size, fill)
+        if outline:
+            ImageDraw.Draw(tile).rectangle([0, 0, size[0] - 1, size[1] - 1], 
+                                           fill=fill, outline=outline, width=1)
+        return tile
     
     def create_card(self, 
                    image_path: str, 
-                   profile_data: Dict[str, Any], 
-                   summary_text: str) -> Image.Image:
+                   content: CardContent) -> Image.Image:
         """
         Create a profile card combining image and text.
         
         Args:
             image_path: Path to the profile image
-            profile_data: Parsed profile data from markdown
-            summary_text: LLM-processed summary text
+            content: Title, summary and profile sections to show on the card
             
         Returns:
             PIL Image object of the composed card
         """
-        # Create base card
-        card = Image.new('RGB', (self.card_width, self.card_height), self.bg_color)
-        draw = ImageDraw.Draw(card)
+        layout = self._layout
         
-        # Draw title bar
-        title_height = 60
-        draw.rectangle([0, 0, self.card_width, title_height], fill=self.title_bg_color)
+        # Start from the pre-rendered background, title bar and summary panel
+        card = self._template.copy()
+        draw = ImageDraw.Draw(card)
         
         # Add title text
-        title = profile_data.get('title', 'Professional Profile')
-        title_bbox = draw.textbbox((0, 0), title, font=self.title_font)
+        title = content.title
+        title_bbox = self.title_font.getbbox(title)
         title_width = title_bbox[2] - title_bbox[0]
         title_x = (self.card_width - title_width) // 2
-        draw.text((title_x, 15), title, fill=self.title_text_color, font=self.title_font)
+        draw.text((title_x, layout.title_y), title, fill=self.title_text_color, font=self.title_font)
         
         # Load and resize profile image
         try:
-            profile_img = Image.open(image_path)
-            profile_img = self._resize_image(profile_img, self.headshot_size)
-            
-            # Paste profile image
-            img_x = self.margin
-            img_y = title_height + self.margin
-            card.paste(profile_img, (img_x, img_y))
+            profile_img = None
+            if cv2 is not None:
+                profile_img = self._resize_image_cv2(image_path, self.headshot_size)
+            if profile_img is not None:
+                self._paste_headshot(card, profile_img)
+            else:
+                # Paste straight from the thumbnailed source while it is open;
+                # its file and decoded pixels are released on exit
+                with Image.open(image_path) as source_img:
+                    self._paste_headshot(card, self._resize_image(source_img, self.headshot_size))
             
         except Exception as e:
             print(f"Warning: Could not load image {image_path}: {e}")
-            # Draw placeholder rectangle
-            img_x = self.margin
-            img_y = title_height + self.margin
-            draw.rectangle([img_x, img_y, img_x + self.headshot_size[0], 
-                          img_y + self.headshot_size[1]], 
-                         fill=(200, 200, 200), outline=(100, 100, 100))
-            draw.text((img_x + 50, img_y + 90), "No Image", fill=self.text_color, font=self.body_font)
-        
-        # Calculate text area
-        text_x = img_x + self.headshot_size[0] + self.margin
-        text_y = title_height + self.margin
-        text_width = self.card_width - text_x - self.margin
-        text_height = self.card_height - text_y - self.margin
-        
-        # Add summary text with background
-        summary_bg_y = text_y - 5
-        summary_bg_height = 140
-        draw.rectangle([text_x - 10, summary_bg_y, self.card_width - self.margin, 
-                       summary_bg_y + summary_bg_height], 
-                      fill=self.section_bg_color, outline=self.accent_color, width=1)
+            # Paste placeholder panel
+            card.paste(self._placeholder_tile, layout.img_pos)
         
-        self._draw_text_section(draw, "AI Summary", summary_text, 
-                              text_x, text_y, text_width)
+        # Add summary text (its panel is part of the template)
+        self._draw_text_section(draw, "AI Summary", content.summary, 
+                              layout.text_x, layout.text_y, layout.text_width)
         
         # Add additional sections if space allows
-        current_y = text_y + 150  # Approximate height for summary section
+        current_y = layout.sections_y
         
         # Add key sections from profile data
-        sections_to_show = ['about', 'key_competencies', 'current_aspirations']
-        for section_key in sections_to_show:
-            if section_key in profile_data and current_y < self.card_height - 80:
-                section_title = section_key.replace('_', ' ').title()
-                section_content = profile_data[section_key]
-                
+        sections_to_show = [
+            ('About', content.about),
+            ('Key Competencies', content.key_competencies),
+            ('Current Aspirations', content.current_aspirations),
+        ]
+        for section_title, section_content in sections_to_show:
+            if section_content is not None and current_y < layout.sections_max_y:
                 # Truncate content if too long
                 if len(section_content) > 200:
                     section_content = section_content[:200] + "..."
                 
                 section_height = self._draw_text_section(
                     draw, section_title, section_content,
-                    text_x, current_y, text_width, max_lines=3
+                    layout.text_x, current_y, layout.text_width, max_lines=3
                 )
                 current_y += section_height + self.section_spacing
         
         return card
     
+    def _paste_headshot(self, card: Image.Image, profile_img: Image.Image):
+        """
+        Paste a resized profile image centered in the headshot area, filling
+        any letterbox around it with white directly on the card.
+        """
+        img_x, img_y = self._layout.img_pos
+        head_w, head_h = self.headshot_size
+        if profile_img.size != self.headshot_size:
+            card.paste((255, 255, 255), self._layout.img_rect)
+        card.paste(profile_img, (img_x + (head_w - profile_img.width) // 2, 
+                                 img_y + (head_h - profile_img.height) // 2))
+    
     def _resize_image(self, img: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
-        """Resize image while maintaining aspect ratio."""
+        """Resize image to fit within target_size, maintaining aspect ratio."""
         img.thumbnail(target_size, Image.Resampling.LANCZOS)
+        return img
+    
+    def _resize_image_cv2(self, image_path: str, target_size: Tuple[int, int]) -> Optional[Image.Image]:
+        """
+        Decode and resize an image with OpenCV to fit within target_size,
+        maintaining aspect ratio.
         
-        # Create a new image with the target size and paste the resized image
-        new_img = Image.new('RGB', target_size, (255, 255, 255))
+        Returns None if the image is left to Pillow or OpenCV cannot
+        decode it, so callers can fall back to Pillow.
+        """
+        flags = self._cv2_read_flags(image_path, target_size)
+        if flags is None:
+            return None
+        img = cv2.imread(image_path, flags)
+        if img is None:
+            return None
         
-        # Center the image
-        x = (target_size[0] - img.width) // 2
-        y = (target_size[1] - img.height) // 2
+        # Like Image.thumbnail, only ever scale down
+        height, width = img.shape[:2]
+        scale = min(target_size[0] / width, target_size[1] / height, 1.0)
+        new_width = max(1, round(width * scale))
+        new_height = max(1, round(height * scale))
+        if scale < 1.0:
+            img = cv2.resize(img, (new_width, new_height), interpolation=cv2.INTER_AREA)
         
-        new_img.paste(img, (x, y))
-        return new_img
+        return Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    
+    def _cv2_read_flags(self, image_path: str, target_size: Tuple[int, int]) -> Optional[int]:
+        """
+        Pick the cv2.imread flags for an image, or None to decode it with Pillow.
+        
+        Cards must look the same with or without OpenCV, so only opaque
+        images that Pillow can identify go through it: transparency and
+        unreadable files (which cv2 would also warn about on stderr) are
+        left to the Pillow path, and EXIF orientation is ignored as Pillow
+        does.
+        
+        JPEGs much larger than the target are decoded at 1/2, 1/4 or 1/8
+        scale by libjpeg-turbo's DCT scaling, keeping at least twice the
+        target resolution for the final INTER_AREA resize.
+        """
+        try:
+            # Only reads the header; pixel data is not decoded
+            with Image.open(image_path) as img:
+                width, height = img.size
+                has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+                is_jpeg = img.format == 'JPEG'
+        except (OSError, IOError):
+            return None
+        
+        if has_alpha:
+            return None
+        if not is_jpeg:
+            return cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+        
+        reduction = min(width / target_size[0], height / target_size[1]) / 2
+        for factor, flags in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                              (4, cv2.IMREAD_REDUCED_COLOR_4),
+                              (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if reduction >= factor:
+                return flags | cv2.IMREAD_IGNORE_ORIENTATION
+        return cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
     
     def _draw_text_section(self, 
                           draw: ImageDraw.Draw, 
@@ -197,24 +351,91 @@ class ImageComposer:
             lines = content.split('\n')
         else:
             # Wrap text
-            chars_per_line = width // 8  # Approximate characters per line
-            lines = textwrap.wrap(content, width=chars_per_line)
+            lines = self._wrap_text(content, width)
         
-        # Limit lines if specified
+        # Limit lines if specified, and stop near the bottom of the card
         if max_lines:
             lines = lines[:max_lines]
+        bottom = self.card_height - 30
+        if current_y > bottom:
+            lines = []
+        else:
+            lines = lines[:(bottom - current_y) // self.line_height + 1]
         
-        for line in lines:
-            if current_y > self.card_height - 30:  # Stop if near bottom
-                break
-            draw.text((x, current_y), line, fill=self.text_color, font=self.body_font)
-            current_y += 18
+        if lines:
+            draw.multiline_text((x, current_y), '\n'.join(lines), fill=self.text_color, 
+                                font=self.body_font, spacing=self._body_line_spacing)
+            current_y += self.line_height * len(lines)
         
         return current_y - y
     
-    def save_card(self, card: Image.Image, output_path: str):
-        """Save the card to a file."""
-        card.save(output_path, 'PNG', quality=95)
+    def _wrap_text(self, text: str, width: int) -> List[str]:
+        """Greedily wrap text into lines that fit within width pixels."""
+        space_width = self.body_font.getlength(' ')
+        lines = []
+        line_words = []
+        line_width = 0.0
+        
+        for word in text.split():
+            word_width = self.body_font.getlength(word)
+            if word_width > width:
+                # Break words wider than a whole line by character, as
+                # textwrap did: the first piece fills the rest of the line
+                room = width - line_width - (space_width if line_words else 0)
+                while word_width > room:
+                    cut = self._fit_prefix(word, room)
+                    if cut == 0 and not line_words:
+                        # Not even one character fits; take it anyway to make progress
+                        cut = 1
+                    if cut:
+                        line_words.append(word[:cut])
+                        word = word[cut:]
+                    lines.append(' '.join(line_words))
+                    line_words = []
+                    line_width = 0.0
+                    word_width = self.body_font.getlength(word)
+                    room = width
+                if not word:
+                    continue
+            if line_words and line_width + space_width + word_width > width:
+                lines.append(' '.join(line_words))
+                line_words = []
+                line_width = 0.0
+            if line_words:
+                line_width += space_width
+            line_words.append(word)
+            line_width += word_width
+        
+        if line_words:
+            lines.append(' '.join(line_words))
+        
+        return lines
+    
+    def _fit_prefix(self, word: str, width: float) -> int:
+        """Return how many leading characters of word fit within width pixels."""
+        low, high = 0, len(word)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.body_font.getlength(word[:mid]) <= width:
+                low = mid
+            else:
+                high = mid - 1
+        return low
+    
+    def save_card(self, card: Image.Image, output_path: str, small: bool = False):
+        """
+        Save the card to a file.
+        
+        Args:
+            card: Card image to save
+            output_path: Path of the PNG file to write
+            small: Trade encoding speed for a smaller file (zlib level 9
+                   instead of the fast level 1)
+        """
+        if small:
+            card.save(output_path, 'PNG', compress_level=9, optimize=True)
+        else:
+            card.save(output_path, 'PNG', compress_level=1)
         print(f"Card saved to: {output_path}")
     
     def get_card_info(self) -> Dict[str, Any]:
@@ -4,8 +4,9 @@ Handles local LLM inference for text summarization and transformation.
 """
 
 import torch
+from functools import cached_property
 from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 import re
 
@@ -13,11 +14,50 @@ import re
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Markdown cleanup patterns, compiled once
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.+?)\*')
+
+# Leading characters of markdown list items
+_BULLET_PREFIXES = frozenset({'-', '*'})
+
+# Words that mark a line as describing a key skill or aspiration
+_KEYWORDS = frozenset({'expert', 'experience', 'proficiency', 'leading', 'building'})
+# One alternation scans a line for all keywords in a single pass
+_KEYWORD_RE = re.compile('|'.join(sorted(_KEYWORDS)))
+
+# Stand-in profile for compile warm-up; about as long as the text
+# MarkdownParser.extract_key_points produces for a typical profile
+_WARMUP_PROFILE = "\n".join([
+    "Profile: Jane Doe - Software Engineer",
+    "",
+    "Key Competencies:",
+    "Python Development: Expert-level proficiency in building scalable web applications",
+    "Machine Learning: Experience with PyTorch and production model deployment",
+    "Cloud Technologies: AWS, Docker and Kubernetes experience",
+    "",
+    "Current Aspirations:",
+    "Leading ML engineering teams and contributing to open-source projects",
+    "",
+    "About:",
+    "Passionate engineer with years of experience building data platforms at scale.",
+])
+
+# Where a summary came from, as reported by summarize_profiles_with_source
+SOURCE_LLM = "llm"            # generated by the model
+SOURCE_LIST = "list"          # the profile's own list items, LLM skipped
+SOURCE_FALLBACK = "fallback"  # rule-based stand-in for an unavailable or failed LLM
+
 
 class LLMProcessor:
     """Handles local LLM inference for text processing."""
     
-    def __init__(self, model_name: str = "microsoft/DialoGPT-medium"):
+    QUANTIZATION_MODES = ("auto", "fp8", "int8", "none")
+    
+    def __init__(self, 
+                 model_name: str = "microsoft/DialoGPT-medium", 
+                 quantization: str = "auto",
+                 compile_model: bool = False):
         """
         Initialize the LLM processor.
         
@@ -25,12 +65,29 @@ class LLMProcessor:
             model_name: Name of the model to use for inference
                        Default is a smaller model for testing. For production,
                        use "mistralai/Mistral-7B-Instruct-v0.1" or similar
+            quantization: Weight quantization for production (non-DialoGPT)
+                         models on CUDA: "fp8", "int8", "none", or "auto"
+                         (fp8 on Hopper and newer, int8 otherwise). A mode
+                         that fails to load falls back to int8, then to
+                         unquantized weights
+            compile_model: Compile the model with torch.compile on CUDA.
+                          Compiling takes far longer than one generation, so
+                          this only pays off for processors that summarize
+                          many profiles, e.g. batch workers
         """
+        if quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization {quantization!r}, "
+                             f"expected one of {', '.join(self.QUANTIZATION_MODES)}")
+        
         self.model_name = model_name
+        self.quantization = quantization
+        self.compile_model = compile_model
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model = None
         self.tokenizer = None
         self.pipeline = None
+        # Extra generate() arguments, e.g. a static KV cache for CUDA graphs
+        self.generate_kwargs: Dict[str, Any] = {}
         
         logger.info(f"LLM Processor initialized with device: {self.device}")
         
@@ -41,27 +98,59 @@ class LLMProcessor:
         """Load the model and tokenizer."""
         try:
             logger.info(f"Loading model: {self.model_name}")
+            dtype = self._select_dtype()
             
             # For this MVP, we'll use a simpler text generation approach
             # In production, use a proper instruction-following model
             if "DialoGPT" in self.model_name:
                 # Lightweight model for testing
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+                # The Rust-backed fast tokenizer is much quicker than the Python one
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+                try:
+                    # Fused scaled_dot_product_attention picks flash/memory-efficient
+                    # kernels where the hardware supports them
+                    self.model = AutoModelForCausalLM.from_pretrained(
+                        self.model_name,
+                        torch_dtype=dtype,
+                        low_cpu_mem_usage=True,
+                        attn_implementation="sdpa",
+                    )
+                except ValueError as e:
+                    # Older transformers releases lack SDPA for some architectures
+                    logger.warning(f"SDPA attention unavailable, using default attention: {e}")
+                    self.model = AutoModelForCausalLM.from_pretrained(
+                        self.model_name,
+                        torch_dtype=dtype,
+                        low_cpu_mem_usage=True,
+                    )
                 
-                if self.tokenizer.pad_token is None:
+                if self.tokenizer.pad_token_id is None:
                     self.tokenizer.pad_token = self.tokenizer.eos_token
+                # Decoder-only models must be left-padded for batched generation
+                self.tokenizer.padding_side = "left"
                 
-                self.model.to(self.device)
+                # from_pretrained already places the weights on the CPU
+                if self.device != "cpu":
+                    self.model = self.model.to(self.device)
+                # Inference only: make sure dropout is off
+                self.model.eval()
+                self._compile_model(self.model, self.tokenizer)
                 
             else:
                 # For larger models like Mistral
-                self.pipeline = pipeline(
-                    "text-generation",
-                    model=self.model_name,
-                    torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
-                    device_map="auto" if self.device == "cuda" else None,
-                )
+                for quantization in self._quantization_modes():
+                    try:
+                        self.pipeline = self._build_pipeline(dtype, self._quantization_config(quantization))
+                        break
+                    except Exception as e:
+                        logger.warning(f"{quantization} quantized load failed: {e}")
+                if self.pipeline is None:
+                    self.pipeline = self._build_pipeline(dtype)
+                
+                if self.pipeline.tokenizer.pad_token_id is None:
+                    self.pipeline.tokenizer.pad_token = self.pipeline.tokenizer.eos_token
+                self.pipeline.tokenizer.padding_side = "left"
+                self._compile_model(self.pipeline.model, self.pipeline.tokenizer)
             
             logger.info("Model loaded successfully")
             
@@ -73,161 +162,416 @@ class LLMProcessor:
             self.tokenizer = None
             self.pipeline = None
     
-    def summarize_profile(self, text: str, max_bullets: int = 4) -> str:
+    def _build_pipeline(self, dtype: torch.dtype, quantization_config: Optional[Any] = None):
+        """Build the text-generation pipeline for larger models."""
+        # Fused scaled_dot_product_attention picks flash/memory-efficient
+        # kernels where the hardware supports them
+        model_kwargs = {"attn_implementation": "sdpa"}
+        if quantization_config is not None:
+            model_kwargs["quantization_config"] = quantization_config
+        
+        try:
+            return self._create_pipeline(dtype, model_kwargs)
+        except ValueError as e:
+            # Older transformers releases lack SDPA for some architectures
+            logger.warning(f"SDPA attention unavailable, using default attention: {e}")
+            del model_kwargs["attn_implementation"]
+            return self._create_pipeline(dtype, model_kwargs)
+    
+    def _create_pipeline(self, dtype: torch.dtype, model_kwargs: Dict[str, Any]):
+        """Create the text-generation pipeline with the given model kwargs."""
+        return pipeline(
+            "text-generation",
+            model=self.model_name,
+            torch_dtype=dtype,
+            device_map="auto" if self.device == "cuda" else None,
+            model_kwargs=model_kwargs,
+        )
+    
+    def _quantization_modes(self) -> List[str]:
+        """
+        Quantization modes to try for the pipeline model, in order.
+        
+        Decoding is bound by weight memory traffic, so 8-bit weights halve
+        the bytes read per token. fp8 needs Hopper, transformers>=4.43 and
+        fbgemm-gpu, so int8 (bitsandbytes) is tried after it. Quantization
+        needs CUDA; an empty list means load the weights unquantized.
+        """
+        if self.quantization == "none" or self.device != "cuda":
+            return []
+        if self.quantization == "int8":
+            return ["int8"]
+        if self.quantization == "fp8" or torch.cuda.get_device_capability()[0] >= 9:
+            return ["fp8", "int8"]
+        return ["int8"]
+    
+    def _quantization_config(self, quantization: str) -> Any:
+        """Build the weight quantization config for an "fp8" or "int8" mode."""
+        if quantization == "fp8":
+            from transformers import FbgemmFp8Config
+            return FbgemmFp8Config()
+        
+        from transformers import BitsAndBytesConfig
+        # A zero outlier threshold keeps every matmul in int8
+        return BitsAndBytesConfig(load_in_8bit=True, llm_int8_threshold=0.0)
+    
+    def _select_dtype(self) -> torch.dtype:
+        """
+        Pick the weight dtype for the current device.
+        
+        Decoding is bound by weight memory traffic, so half precision is used
+        wherever the hardware computes it natively: bf16 (or fp16) on CUDA,
+        bf16 on CPUs with AVX512-BF16, and fp32 otherwise.
+        """
+        if self.device == "cuda":
+            return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        
+        is_avx512_bf16_supported = getattr(torch.cpu, "_is_avx512_bf16_supported", None)
+        if is_avx512_bf16_supported is not None and is_avx512_bf16_supported():
+            return torch.bfloat16
+        return torch.float32
+    
+    def _compile_model(self, model, tokenizer):
+        """
+        Compile the model's forward pass with torch.compile on CUDA, if enabled.
+        
+        The forward method is compiled (rather than wrapping the module) so
+        that generate() runs the compiled graph. Compilation is paid up front
+        with warm-up generations on realistic prompts of two lengths, so the
+        prompt length is compiled as a dynamic dimension and real prompts do
+        not trigger a recompile; on any failure the model stays eager.
+        
+        "reduce-overhead" captures each decode step as a CUDA graph. Those
+        graphs can only be replayed when the step's tensor shapes are fixed,
+        so models that support it decode with a static, pre-allocated KV
+        cache instead of one that grows every token.
+        """
+        if not (self.compile_model and hasattr(torch, "compile") and self.device == "cuda"):
+            return
+        
+        eager_forward = model.forward
+        generate_kwargs = {}
+        if getattr(model, "_supports_static_cache", False):
+            generate_kwargs["cache_implementation"] = "static"
+        
+        try:
+            model.forward = torch.compile(eager_forward, mode="reduce-overhead", fullgraph=False)
+            
+            for profile in (_WARMUP_PROFILE, _WARMUP_PROFILE[:len(_WARMUP_PROFILE) // 2]):
+                if self.pipeline is not None:
+                    prompt = self._pipeline_prompt(profile, 4)
+                else:
+                    prompt = self._model_prompt(profile)
+                inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+                with torch.inference_mode():
+                    model.generate(**inputs, max_new_tokens=4, 
+                                   pad_token_id=tokenizer.eos_token_id, **generate_kwargs)
+            
+            self.generate_kwargs.update(generate_kwargs)
+            logger.info("Model compiled with torch.compile")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager mode: {e}")
+            model.forward = eager_forward
+    
+    def summarize_profile(self, 
+                          text: str, 
+                          max_bullets: int = 4, 
+                          force_llm: bool = False,
+                          list_text: Optional[str] = None) -> str:
         """
         Summarize profile text into key bullet points.
         
         Args:
             text: Input text to summarize
             max_bullets: Maximum number of bullet points to generate
+            force_llm: Use the LLM even if the profile already has enough bullets
+            list_text: Profile text with its markdown list markers intact;
+                       see summarize_profiles
             
         Returns:
             Summarized text with bullet points
         """
-        if self.pipeline:
-            return self._summarize_with_pipeline(text, max_bullets)
-        elif self.model and self.tokenizer:
-            return self._summarize_with_model(text, max_bullets)
-        else:
-            return self._summarize_rule_based(text, max_bullets)
+        list_texts = None if list_text is None else [list_text]
+        return self.summarize_profiles([text], max_bullets, force_llm=force_llm,
+                                       list_texts=list_texts)[0]
+    
+    def summarize_profiles(self, 
+                           texts: List[str], 
+                           max_bullets: int = 4, 
+                           force_llm: bool = False,
+                           list_texts: Optional[List[str]] = None) -> List[str]:
+        """
+        Summarize several profiles in one batched generation.
+        
+        Profiles that already contain at least max_bullets list items are
+        summarized rule-based, skipping the LLM, unless force_llm is set.
+        List items are counted and summarized from list_texts when given,
+        since LLM input such as MarkdownParser.extract_key_points output
+        has its list markers stripped.
+        
+        Args:
+            texts: Input texts to summarize
+            max_bullets: Maximum number of bullet points per summary
+            force_llm: Use the LLM for every text, e.g. for paraphrased output
+            list_texts: Optional per-text profile content with list markers
+            
+        Returns:
+            Summarized text with bullet points, one per input text
+        """
+        results = self.summarize_profiles_with_source(texts, max_bullets, force_llm=force_llm,
+                                                      list_texts=list_texts)
+        return [summary for summary, _ in results]
+    
+    def summarize_profiles_with_source(self, 
+                                       texts: List[str], 
+                                       max_bullets: int = 4, 
+                                       force_llm: bool = False,
+                                       list_texts: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Summarize several profiles and report where each summary came from.
+        
+        Takes the same arguments as summarize_profiles.
+        
+        Returns:
+            (summary, source) pairs, one per input text. source is
+            SOURCE_LLM for generated text, SOURCE_LIST for the list-item
+            shortcut, and SOURCE_FALLBACK when the LLM is unavailable or
+            failed and the rule-based summarizer stood in for it
+        """
+        # Rule-based summaries read the list items whenever they are given,
+        # so the output does not depend on whether the model loaded
+        rule_texts = list_texts if list_texts is not None else texts
+        has_model = bool(self.pipeline or (self.model and self.tokenizer))
+        
+        results: List[Optional[Tuple[str, str]]] = [None] * len(texts)
+        llm_indices = []
+        for i, rule_text in enumerate(rule_texts):
+            list_summary = None if force_llm else self.summarize_list_items(rule_text, max_bullets)
+            if list_summary is not None:
+                results[i] = (list_summary, SOURCE_LIST)
+            elif has_model:
+                llm_indices.append(i)
+            else:
+                results[i] = (self._summarize_rule_based(rule_text, max_bullets), SOURCE_FALLBACK)
+        
+        if llm_indices:
+            llm_texts = [texts[i] for i in llm_indices]
+            if self.pipeline:
+                llm_summaries = self._summarize_with_pipeline(llm_texts, max_bullets)
+            else:
+                llm_summaries = self._summarize_with_model(llm_texts, max_bullets)
+            for i, summary in zip(llm_indices, llm_summaries):
+                if summary is None:
+                    results[i] = (self._summarize_rule_based(rule_texts[i], max_bullets), SOURCE_FALLBACK)
+                else:
+                    results[i] = (summary, SOURCE_LLM)
+        
+        return results
+    
+    @staticmethod
+    def summarize_list_items(list_text: str, max_bullets: int = 4) -> Optional[str]:
+        """
+        Summarize a profile from its own list items, if it has enough.
+        
+        This needs no model, so callers can check it before loading one.
+        
+        Args:
+            list_text: Profile content with its markdown list markers intact
+            max_bullets: Number of bullet points wanted
+            
+        Returns:
+            Rule-based summary, or None if the profile has fewer than
+            max_bullets list items and needs the LLM
+        """
+        if LLMProcessor._count_bullets(list_text) < max_bullets:
+            return None
+        return LLMProcessor._summarize_rule_based(list_text, max_bullets)
+    
+    @staticmethod
+    def _count_bullets(text: str) -> int:
+        """Count the markdown list items the rule-based summarizer can use."""
+        return sum(1 for line in text.split('\n') if line.lstrip()[:1] in _BULLET_PREFIXES)
     
-    def _summarize_with_pipeline(self, text: str, max_bullets: int) -> str:
-        """Summarize using Hugging Face pipeline."""
-        prompt = f"""Summarize this profile in {max_bullets} clear bullet points highlighting the most important skills and aspirations:
+    def _pipeline_prompt(self, text: str, max_bullets: int) -> str:
+        """Build the instruction prompt for the pipeline model."""
+        return f"""Summarize this profile in {max_bullets} clear bullet points highlighting the most important skills and aspirations:
 
 {text}
 
 Summary:
 •"""
+    
+    def _model_prompt(self, text: str) -> str:
+        """Build the prompt for the small DialoGPT model."""
+        return f"Profile summary: {text[:500]}..."  # Truncate for smaller models
+    
+    def _summarize_with_pipeline(self, texts: List[str], max_bullets: int) -> List[Optional[str]]:
+        """Summarize using Hugging Face pipeline; None marks a failed generation."""
+        prompts = [self._pipeline_prompt(text, max_bullets) for text in texts]
         
         try:
-            result = self.pipeline(
-                prompt,
-                max_new_tokens=200,
-                do_sample=True,
-                temperature=0.7,
-                pad_token_id=self.pipeline.tokenizer.eos_token_id
-            )
+            with torch.inference_mode():
+                results = self.pipeline(
+                    prompts,
+                    batch_size=len(prompts),
+                    max_new_tokens=200,
+                    do_sample=True,
+                    temperature=0.7,
+                    pad_token_id=self.pipeline.tokenizer.eos_token_id,
+                    **self.generate_kwargs
+                )
             
-            generated_text = result[0]['generated_text']
-            # Extract the summary part
-            summary_start = generated_text.find("Summary:")
-            if summary_start != -1:
-                summary = generated_text[summary_start + len("Summary:"):]
-                return self._clean_summary(summary)
+            summaries = []
+            for result in results:
+                generated_text = result[0]['generated_text']
+                # Extract the summary part
+                summary_start = generated_text.find("Summary:")
+                if summary_start != -1:
+                    summary = generated_text[summary_start + len("Summary:"):]
+                    summaries.append(self._clean_summary(summary))
+                else:
+                    summaries.append(None)
+            return summaries
             
         except Exception as e:
             logger.error(f"Error in pipeline summarization: {e}")
         
-        # Fallback to rule-based
-        return self._summarize_rule_based(text, max_bullets)
+        # The caller falls back to rule-based
+        return [None] * len(texts)
     
-    def _summarize_with_model(self, text: str, max_bullets: int) -> str:
-        """Summarize using loaded model and tokenizer."""
-        prompt = f"Profile summary: {text[:500]}..."  # Truncate for smaller models
+    def _summarize_with_model(self, texts: List[str], max_bullets: int) -> List[Optional[str]]:
+        """Summarize using loaded model and tokenizer; None marks a failed generation."""
+        prompts = [self._model_prompt(text) for text in texts]
         
         try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt").to(self.device)
+            inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, 
+                                    truncation=True, max_length=512).to(self.device)
             
-            with torch.no_grad():
+            # generate() feeds only the newest token each step and reuses
+            # past keys/values for the prompt, so decoding stays linear
+            with torch.inference_mode():
                 outputs = self.model.generate(
-                    inputs,
-                    max_length=inputs.shape[1] + 100,
+                    **inputs,
+                    max_new_tokens=100,
                     num_return_sequences=1,
                     temperature=0.7,
                     do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id
+                    use_cache=True,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    **self.generate_kwargs
                 )
             
-            generated = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            # Extract the new part
-            summary = generated[len(prompt):].strip()
-            return self._clean_summary(summary) if summary else self._summarize_rule_based(text, max_bullets)
+            # Decode only the new tokens rather than re-decoding the prompts
+            new_tokens = outputs[:, inputs["input_ids"].shape[1]:]
+            summaries = []
+            for tokens in new_tokens:
+                summary = self.tokenizer.decode(tokens, skip_special_tokens=True).strip()
+                summaries.append(self._clean_summary(summary) if summary else None)
+            return summaries
             
         except Exception as e:
             logger.error(f"Error in model summarization: {e}")
         
-        # Fallback to rule-based
-        return self._summarize_rule_based(text, max_bullets)
+        # The caller falls back to rule-based
+        return [None] * len(texts)
     
-    def _summarize_rule_based(self, text: str, max_bullets: int) -> str:
+    @staticmethod
+    def _summarize_rule_based(text: str, max_bullets: int) -> str:
         """Fallback rule-based summarization."""
         logger.info("Using rule-based summarization")
         
-        # Extract key phrases and sentences
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        # Extract key phrases and sentences; lines are stripped as they are read
+        raw = text.splitlines()
         
-        # Look for bullet points or key information
-        bullets = []
-        current_section = ""
+        # Unique bullets in insertion order; collection stops at max_bullets
+        bullets: Dict[str, None] = {}
+        
+        def add_bullet(bullet: str) -> bool:
+            """Add a bullet if there is room; return True once full."""
+            if bullet not in bullets and len(bullets) < max_bullets:
+                bullets[bullet] = None
+            return len(bullets) >= max_bullets
         
-        for line in lines:
-            # Check if this is a section header
-            if ':' in line and not line.startswith('-') and not line.startswith('*'):
-                current_section = line.split(':')[0].strip()
+        # Look for bullet points or key information
+        for raw_line in raw:
+            line = raw_line.strip()
+            if not line:
+                continue
+            is_bullet = line[:1] in _BULLET_PREFIXES
+            
+            # Skip section headers
+            if ':' in line and not is_bullet:
                 continue
             
             # Process bullet points
-            if line.startswith('-') or line.startswith('*'):
-                # Clean and extract key info
-                clean_line = line.lstrip('- *').strip()
+            if is_bullet:
+                # Clean and extract key info; only the list marker is stripped
+                # so that leading **bold** markup stays intact for removal
+                clean_line = line[1:].lstrip()
                 # Remove markdown formatting
-                clean_line = re.sub(r'\*\*(.+?)\*\*', r'\1', clean_line)  # Remove bold
-                clean_line = re.sub(r'\*(.+?)\*', r'\1', clean_line)      # Remove italic
+                clean_line = _BOLD_RE.sub(r'\1', clean_line)  # Remove bold
+                clean_line = _ITALIC_RE.sub(r'\1', clean_line)  # Remove italic
                 
                 if len(clean_line) > 10:  # Filter out very short lines
                     # Extract key skill/achievement
                     if ':' in clean_line:
                         skill_part = clean_line.split(':')[0].strip()
-                        bullets.append(f"• {skill_part}")
+                        full = add_bullet('• ' + skill_part)
                     else:
-                        bullets.append(f"• {clean_line}")
+                        full = add_bullet('• ' + clean_line)
+                    if full:
+                        break
         
         # If no bullets found, extract key sentences from text
         if not bullets:
             # Look for key competencies, skills, aspirations
-            for line in lines:
-                if any(keyword in line.lower() for keyword in ['expert', 'experience', 'proficiency', 'leading', 'building']):
-                    clean_line = line.strip().replace('- ', '').replace('* ', '')
-                    if len(clean_line) > 10:
-                        bullets.append(f"• {clean_line}")
+            for raw_line in raw:
+                line = raw_line.strip()
+                if _KEYWORD_RE.search(line.lower()):
+                    clean_line = line.replace('- ', '').replace('* ', '')
+                    if len(clean_line) > 10 and add_bullet('• ' + clean_line):
+                        break
         
         # If still no bullets, fall back to first few meaningful lines
         if not bullets:
-            sentences = []
-            for line in lines:
-                if len(line) > 20 and not line.startswith('#'):
-                    sentences.append(line)
-            bullets = [f"• {s}" for s in sentences[:max_bullets]]
-        
-        # Limit to max_bullets and ensure unique
-        unique_bullets = []
-        seen = set()
-        for bullet in bullets:
-            if bullet not in seen and len(unique_bullets) < max_bullets:
-                unique_bullets.append(bullet)
-                seen.add(bullet)
-        
-        return '\n'.join(unique_bullets)
+            taken = 0
+            for raw_line in raw:
+                if taken >= max_bullets:
+                    break
+                line = raw_line.strip()
+                if len(line) > 20 and line[:1] != '#':
+                    add_bullet('• ' + line)
+                    taken += 1
+        
+        return '\n'.join(bullets)
     
     def _clean_summary(self, summary: str) -> str:
         """Clean up generated summary text."""
-        # Remove extra whitespace and format bullets
-        lines = [line.strip() for line in summary.split('\n') if line.strip()]
+        # Remove extra whitespace and format bullets; stop at the 4-bullet limit
         cleaned = []
         
-        for line in lines:
-            if line and not line.startswith('•'):
-                line = f"• {line}"
+        for line in summary.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line[:1] != '•':
+                line = '• ' + line
             cleaned.append(line)
+            if len(cleaned) == 4:
+                break
         
-        return '\n'.join(cleaned[:4])  # Limit to 4 bullets
+        return '\n'.join(cleaned)
     
-    def get_device_info(self) -> Dict[str, Any]:
-        """Get information about the device and model."""
+    @cached_property
+    def device_info(self) -> Dict[str, Any]:
+        """Information about the device and model; fixed once loading is done."""
         return {
             "device": self.device,
             "model_name": self.model_name,
             "cuda_available": torch.cuda.is_available(),
             "model_loaded": self.model is not None or self.pipeline is not None
-        }
\ No newline at end of file
+        }
+    
+    def get_device_info(self) -> Dict[str, Any]:
+        """Get information about the device and model."""
+        return self.device_info
\ No newline at end of file
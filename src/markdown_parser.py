@@ -3,18 +3,55 @@ Markdown parser module for CardForge.
 Handles parsing and extracting content from markdown files.
 """
 
-import markdown
-from typing import Dict, Any
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional
 import re
 
+# Markdown cleanup patterns, compiled once
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.+?)\*')
+
+
+
+@dataclass(slots=True)
+class ProfileSections:
+    """Sections parsed from a profile markdown file."""
+    title: str = "Profile"
+    # Sections passed to the LLM, in order of importance
+    key_competencies: Optional[str] = None
+    competencies: Optional[str] = None
+    skills: Optional[str] = None
+    current_aspirations: Optional[str] = None
+    aspirations: Optional[str] = None
+    goals: Optional[str] = None
+    about: Optional[str] = None
+    summary: Optional[str] = None
+    overview: Optional[str] = None
+    recent_achievements: Optional[str] = None
+    achievements: Optional[str] = None
+    accomplishments: Optional[str] = None
+    # Whole file, used when it has no sections
+    content: Optional[str] = None
+    extras: Dict[str, str] = field(default_factory=dict)
+    
+    def section_names(self) -> List[str]:
+        """Return the names of all sections that have content."""
+        names = [f.name for f in fields(self)
+                 if f.name != 'extras' and getattr(self, f.name) is not None]
+        return names + list(self.extras)
+
+
+_SECTION_FIELDS = frozenset(f.name for f in fields(ProfileSections)) - {'extras'}
+
+# The section fields in declaration order, i.e. order of importance
+_PRIORITY_SECTIONS = tuple(f.name for f in fields(ProfileSections)
+                           if f.name not in ('title', 'content', 'extras'))
+
 
 class MarkdownParser:
     """Parses markdown files and extracts structured content."""
     
-    def __init__(self):
-        self.md = markdown.Markdown(extensions=['meta'])
-    
-    def parse_file(self, file_path: str) -> Dict[str, Any]:
+    def parse_file(self, file_path: str) -> ProfileSections:
         """
         Parse a markdown file and extract structured content.
         
@@ -22,14 +59,14 @@ class MarkdownParser:
             file_path: Path to the markdown file
             
         Returns:
-            Dictionary containing parsed content
+            Parsed profile sections
         """
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
         return self.parse_content(content)
     
-    def parse_content(self, content: str) -> Dict[str, Any]:
+    def parse_content(self, content: str) -> ProfileSections:
         """
         Parse markdown content and extract structured data.
         
@@ -37,41 +74,52 @@ class MarkdownParser:
             content: Raw markdown content
             
         Returns:
-            Dictionary with parsed sections
+            Parsed profile sections; unknown section names go to ``extras``
         """
-        html = self.md.convert(content)
-        
-        # Extract sections using regex patterns
-        sections = {}
+        title = None
+        parsed_sections = []
+        section_name = None
+        section_lines = []
         
-        # Extract title (first h1 or h2)
-        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-        if title_match:
-            sections['title'] = title_match.group(1).strip()
-        else:
-            sections['title'] = "Profile"
+        # Single pass over the lines: the first "# " line is the title, and
+        # each "## " line starts a new section that collects the lines below
+        for line in content.splitlines():
+            if line[:2] == '##' and line[2:3].isspace():
+                if section_name is not None:
+                    parsed_sections.append((section_name, section_lines))
+                section_name = line[2:].strip().lower().replace(' ', '_')
+                section_lines = []
+                continue
+            
+            if title is None and line[:1] == '#' and line[1:2].isspace() and line[1:].strip():
+                title = line[1:].strip()
+            
+            if section_name is not None:
+                section_lines.append(line)
         
-        # Split content by ## headers and process each section
-        # Split on lines that start with ##
-        parts = re.split(r'^##\s+', content, flags=re.MULTILINE)
+        if section_name is not None:
+            parsed_sections.append((section_name, section_lines))
         
-        # First part contains title and any content before first ##
-        # Skip it and process the rest
-        for part in parts[1:]:
-            lines = part.split('\n')
-            if lines:
-                section_name = lines[0].strip().lower().replace(' ', '_')
-                section_content = '\n'.join(lines[1:]).strip()
-                if section_content:
-                    sections[section_name] = section_content
+        sections = ProfileSections(title=title if title is not None else "Profile")
+        found_any = False
+        for section_name, section_lines in parsed_sections:
+            section_content = '\n'.join(section_lines).strip()
+            if not section_content:
+                continue
+            if section_name != 'title':
+                found_any = True
+            if section_name in _SECTION_FIELDS:
+                setattr(sections, section_name, section_content)
+            else:
+                sections.extras[section_name] = section_content
         
         # If no sections found, use the entire content
-        if len(sections) == 1:  # Only title
-            sections['content'] = content
+        if not found_any:
+            sections.content = content
         
         return sections
     
-    def extract_key_points(self, sections: Dict[str, Any]) -> str:
+    def extract_key_points(self, sections: ProfileSections) -> str:
         """
         Extract key points from parsed sections for LLM processing.
         
@@ -84,24 +132,32 @@ class MarkdownParser:
         key_content = []
         
         # Add title
-        if 'title' in sections:
-            key_content.append(f"Profile: {sections['title']}")
+        key_content.append(f"Profile: {sections.title}")
         
         # Add key sections in order of importance
-        priority_sections = [
-            'key_competencies', 'competencies', 'skills',
-            'current_aspirations', 'aspirations', 'goals',
-            'about', 'summary', 'overview',
-            'recent_achievements', 'achievements', 'accomplishments'
-        ]
+        for section_key in _PRIORITY_SECTIONS:
+            content = getattr(sections, section_key)
+            if content is None:
+                continue
+            # Clean up markdown formatting
+            content = _BOLD_RE.sub(r'\1', content)  # Remove bold
+            content = _ITALIC_RE.sub(r'\1', content)  # Remove italic
+            content = content.replace('\n- ', '\n')  # Clean bullets
+            if content.startswith('- '):
+                content = content[2:]
+            key_content.append(f"{section_key.replace('_', ' ').title()}:\n{content}")
         
-        for section_key in priority_sections:
-            if section_key in sections:
-                content = sections[section_key]
-                # Clean up markdown formatting
-                content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)  # Remove bold
-                content = re.sub(r'\*(.+?)\*', r'\1', content)      # Remove italic
-                content = re.sub(r'^- ', '', content, flags=re.MULTILINE)  # Clean bullets
-                key_content.append(f"{section_key.replace('_', ' ').title()}:\n{content}")
+        return "\n\n".join(key_content)
+    
+    def extract_list_text(self, sections: ProfileSections) -> str:
+        """
+        Join the key sections with their markdown list markers intact.
         
-        return "\n\n".join(key_content)
\ No newline at end of file
+        Args:
+            sections: Parsed markdown sections
+            
+        Returns:
+            Section text for counting and summarizing list items
+        """
+        contents = (getattr(sections, section_key) for section_key in _PRIORITY_SECTIONS)
+        return "\n\n".join(content for content in contents if content)
\ No newline at end of file
@@ -11,9 +11,36 @@ from PIL import Image
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.markdown_parser import MarkdownParser
-from src.llm_processor import LLMProcessor
-from src.image_composer import ImageComposer
+from src.markdown_parser import MarkdownParser, ProfileSections
+from src.llm_processor import LLMProcessor, SOURCE_FALLBACK, SOURCE_LLM
+from src.image_composer import CardContent, ImageComposer
+import generate_card
+
+# Loading the model is the slowest part of the suite, so tests share one processor
+_CACHED = {}
+
+
+def _get_llm() -> LLMProcessor:
+    """Return the shared LLM processor, loading it on first use."""
+    if "processor" not in _CACHED:
+        _CACHED["processor"] = LLMProcessor()
+    return _CACHED["processor"]
+
+
+class _StubLLM:
+    """Stand-in processor that records calls instead of running a model."""
+    
+    def __init__(self, source: str):
+        self.source = source
+        self.calls = 0
+    
+    def get_device_info(self):
+        return {"device": "cpu", "model_name": "stub", "cuda_available": False,
+                "model_loaded": self.source != SOURCE_FALLBACK}
+    
+    def summarize_profiles_with_source(self, texts, max_bullets=4, force_llm=False, list_texts=None):
+        self.calls += 1
+        return [("• Stub summary line", self.source) for _ in texts]
 
 
 def test_markdown_parser():
@@ -41,10 +68,11 @@ Experienced software engineer.
     
     expected_sections = ['title', 'skills', 'goals', 'about']
     for section in expected_sections:
-        assert section in result, f"Missing section: {section}"
+        assert getattr(result, section) is not None, f"Missing section: {section}"
     
-    assert result['title'] == "Test Profile"
-    assert "Python Programming" in result['skills']
+    assert result.title == "Test Profile"
+    assert "Python Programming" in result.skills
+    assert result.extras == {}
     print("✅ Markdown Parser tests passed")
 
 
@@ -52,7 +80,7 @@ def test_llm_processor():
     """Test LLM processor functionality."""
     print("Testing LLM Processor...")
     
-    processor = LLMProcessor()
+    processor = _get_llm()
     
     test_text = """Profile: John Doe
 
@@ -69,9 +97,58 @@ Current Aspirations:
     
     assert len(result) > 0, "Summary should not be empty"
     assert "•" in result, "Summary should contain bullet points"
+    
+    results = processor.summarize_profiles([test_text, "Profile: Jane Doe\n\n- Building data platforms at scale"])
+    assert len(results) == 2, "Should return one summary per profile"
+    assert all("•" in summary for summary in results), "Summaries should contain bullet points"
     print("✅ LLM Processor tests passed")
 
 
+def test_bullet_shortcut():
+    """Test that profiles with enough list items skip the LLM unless forced."""
+    print("Testing Bullet Shortcut...")
+    
+    parser = MarkdownParser()
+    profile_data = parser.parse_file("examples/profile.md")
+    key_content = parser.extract_key_points(profile_data)
+    list_text = parser.extract_list_text(profile_data)
+    
+    # A processor with a stand-in model, so no weights are loaded
+    processor = LLMProcessor.__new__(LLMProcessor)
+    processor.pipeline = None
+    processor.model = processor.tokenizer = object()
+    llm_calls = []
+    
+    def fake_generate(texts, max_bullets):
+        llm_calls.append(texts)
+        return ["• LLM summary"] * len(texts)
+    
+    processor._summarize_with_model = fake_generate
+    
+    summary = processor.summarize_profile(key_content, list_text=list_text)
+    assert not llm_calls, "Enough list items should skip the LLM"
+    assert summary.startswith("• Python Development"), summary
+    
+    summary = processor.summarize_profile(key_content, force_llm=True, list_text=list_text)
+    assert llm_calls == [[key_content]], "force_llm should send the key content to the LLM"
+    assert summary == "• LLM summary"
+    
+    # Without a model the rule-based summary reads the same list items
+    model_summary = processor.summarize_profile(key_content, list_text=list_text)
+    processor.model = processor.tokenizer = None
+    assert processor.summarize_profile(key_content, list_text=list_text) == model_summary
+    summary, source = processor.summarize_profiles_with_source(
+        [key_content], force_llm=True, list_texts=[list_text])[0]
+    assert source == SOURCE_FALLBACK and summary == model_summary, (summary, source)
+    processor.model = processor.tokenizer = object()
+    
+    # A failed generation is reported as a rule-based fallback
+    processor._summarize_with_model = lambda texts, max_bullets: [None] * len(texts)
+    summary, source = processor.summarize_profiles_with_source([key_content], force_llm=True)[0]
+    assert source == SOURCE_FALLBACK and summary.startswith("•"), (summary, source)
+    print("✅ Bullet shortcut tests passed")
+
+
 def test_image_composer():
     """Test image composition functionality."""
     print("Testing Image Composer...")
@@ -85,15 +162,19 @@ def test_image_composer():
         tmp_path = tmp.name
     
     try:
-        profile_data = {
-            'title': 'Test Profile',
-            'about': 'Test description',
-            'key_competencies': 'Test skills'
-        }
+        profile_data = ProfileSections(
+            title='Test Profile',
+            about='Test description',
+            key_competencies='Test skills'
+        )
         
         summary_text = "• Test skill 1\n• Test skill 2"
         
-        card = composer.create_card(tmp_path, profile_data, summary_text)
+        content = CardContent.from_profile(profile_data, summary_text)
+        assert content.title == 'Test Profile'
+        assert content.current_aspirations is None
+        
+        card = composer.create_card(tmp_path, content)
         
         assert card.size == (400, 300), f"Card size mismatch: {card.size}"
         print("✅ Image Composer tests passed")
@@ -120,12 +201,12 @@ def test_full_pipeline():
     
     # Test the pipeline components
     parser = MarkdownParser()
-    processor = LLMProcessor()
+    processor = _get_llm()
     composer = ImageComposer()
     
     # Parse markdown
     profile_data = parser.parse_file(example_markdown)
-    assert 'title' in profile_data
+    assert profile_data.title
     
     # Extract key content
     key_content = parser.extract_key_points(profile_data)
@@ -136,12 +217,112 @@ def test_full_pipeline():
     assert len(summary_text) > 0
     
     # Create card
-    card = composer.create_card(example_image, profile_data, summary_text)
+    card = composer.create_card(example_image, CardContent.from_profile(profile_data, summary_text))
     assert card.size == (800, 600)
     
     print("✅ Full pipeline tests passed")
 
 
+def test_card_cache():
+    """Test that only cards with a model summary are restored from the cache."""
+    print("Testing Card Cache...")
+    
+    example_image = "examples/input_photo.png"
+    original_cache_dir = generate_card.CACHE_DIR
+    original_get_llm = generate_card._get_llm_processor
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "card.png")
+        # Too few list items for the shortcut, so the LLM is needed
+        example_markdown = os.path.join(tmp_dir, "profile.md")
+        with open(example_markdown, 'w', encoding='utf-8') as f:
+            f.write("# Test Profile\n\n## About\nExperienced engineer building data platforms.\n")
+        generate_card.CACHE_DIR = os.path.join(tmp_dir, "cache")
+        try:
+            # Rule-based fallback (no model, or generation failed): never cached
+            stub = _StubLLM(SOURCE_FALLBACK)
+            generate_card._get_llm_processor = lambda *args: stub
+            generate_card.generate_one(example_image, example_markdown, output_path)
+            generate_card.generate_one(example_image, example_markdown, output_path)
+            assert stub.calls == 2, "Fallback cards should be regenerated"
+            assert not os.path.exists(os.path.join(generate_card.CACHE_DIR, "cards"))
+            assert not os.path.exists(os.path.join(generate_card.CACHE_DIR, "summaries"))
+            
+            # Model summary: the first run misses and fills the cache, the second hits
+            stub = _StubLLM(SOURCE_LLM)
+            generate_card._get_llm_processor = lambda *args: stub
+            generate_card.generate_one(example_image, example_markdown, output_path)
+            assert stub.calls == 1
+            os.unlink(output_path)
+            generate_card.generate_one(example_image, example_markdown, output_path)
+            assert stub.calls == 1, "Cached card should skip the LLM"
+            assert os.path.exists(output_path)
+            
+            # Without the cache the LLM runs again
+            generate_card.generate_one(example_image, example_markdown, output_path,
+                                       use_cache=False)
+            assert stub.calls == 2
+            
+            # Enough list items: the model is never loaded and the card is cached
+            def fail_to_load(*args):
+                raise AssertionError("The LLM should not be loaded")
+            generate_card._get_llm_processor = fail_to_load
+            generate_card.generate_one(example_image, "examples/profile.md", output_path)
+            assert len(os.listdir(os.path.join(generate_card.CACHE_DIR, "cards"))) == 2
+        finally:
+            generate_card.CACHE_DIR = original_cache_dir
+            generate_card._get_llm_processor = original_get_llm
+    
+    print("✅ Card cache tests passed")
+
+
+def test_read_manifest():
+    """Test batch manifest parsing and validation."""
+    print("Testing Batch Manifest...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manifest_path = os.path.join(tmp_dir, "manifest.csv")
+        absolute_image = os.path.join(tmp_dir, "abs.png")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            f.write("image,markdown,output\n")
+            f.write("photo.png, profile.md ,out/card.png\n")
+            f.write(f"{absolute_image},profile.md,card2.png\n")
+        
+        rows = generate_card.read_manifest(manifest_path)
+        assert rows == [
+            (os.path.join(tmp_dir, "photo.png"), os.path.join(tmp_dir, "profile.md"),
+             os.path.join(tmp_dir, "out", "card.png")),
+            (absolute_image, os.path.join(tmp_dir, "profile.md"),
+             os.path.join(tmp_dir, "card2.png")),
+        ], rows
+        
+        # A short row names its line instead of failing on None
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            f.write("image,markdown,output\nphoto.png,profile.md,card.png\nphoto.png,profile.md\n")
+        try:
+            generate_card.read_manifest(manifest_path)
+        except ValueError as e:
+            assert "line 3" in str(e) and "output" in str(e), str(e)
+        else:
+            raise AssertionError("Short manifest row should raise ValueError")
+        
+        # A missing column is reported before any row is read
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            f.write("image,output\nphoto.png,card.png\n")
+        try:
+            generate_card.read_manifest(manifest_path)
+        except ValueError as e:
+            assert "markdown" in str(e), str(e)
+        else:
+            raise AssertionError("Missing manifest column should raise ValueError")
+    
+    # The manifest used in the README points at the bundled examples
+    rows = generate_card.read_manifest("examples/manifest.csv")
+    assert rows and all(os.path.exists(image) and os.path.exists(markdown)
+                        for image, markdown, _ in rows), rows
+    print("✅ Batch manifest tests passed")
+
+
 def main():
     """Run all tests."""
     print("🧪 Running CardForge Tests...\n")
@@ -149,8 +330,11 @@ def main():
     try:
         test_markdown_parser()
         test_llm_processor()
+        test_bullet_shortcut()
         test_image_composer()
         test_full_pipeline()
+        test_card_cache()
+        test_read_manifest()
         
         print("\n🎉 All tests passed! CardForge is working correctly.")
         